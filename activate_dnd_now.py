@@ -1,6 +1,7 @@
 """
 Comprehensive DND activation with Windows Settings opening
 """
+import os
 import winreg
 import subprocess
 import sys
@@ -90,11 +91,7 @@ print("   [ACTION REQUIRED] A Windows Settings window should open")
 print("   [ACTION REQUIRED] Please verify Focus Assist is set to 'Alarms only'")
 print("   [ACTION REQUIRED] If it shows 'Off', click to toggle it to 'Alarms only'")
 try:
-    subprocess.Popen(
-        ["ms-settings:quiethours"],
-        shell=True,
-        creationflags=subprocess.CREATE_NO_WINDOW
-    )
+    os.startfile("ms-settings:quiethours")  # ShellExecute directly, no cmd.exe
     print("   [OK] Windows Settings opened")
 except Exception as e:
     print(f"   [ERROR] Could not open settings: {e}")
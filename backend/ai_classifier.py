@@ -29,13 +29,31 @@ class AIClassifier:
         self.api_key = api_key or AI_API_KEY
         self.endpoint = endpoint or AI_API_ENDPOINT
         self.cache = {}  # Cache classifications to reduce API calls
+        self._session = None  # Keep-alive HTTP session shared by every API call
         
         if not self.api_key:
             logger.warning("AI API key not configured. Using fallback keyword matching.")
             self.use_fallback = True
-        else:
-            self.use_fallback = False
-            logger.info("AI classifier initialized with API")
+            return
+        
+        try:
+            import requests
+        except ImportError:
+            logger.warning("requests not installed. Using fallback keyword matching.")
+            self.use_fallback = True
+            return
+        
+        # Built once here (not lazily) so concurrent classify calls share one pooled session
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self._session.mount("https://", adapter)
+        
+        self.use_fallback = False
+        logger.info("AI classifier initialized with API")
     
     def classify_url(self, url: str, context: Optional[Dict] = None) -> Dict:
         """
@@ -166,11 +184,6 @@ Respond in JSON format:
         # Groq API endpoint
         url = "https://api.groq.com/openai/v1/chat/completions"
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
         payload = {
             "model": "llama-3.1-8b-instant",
             "messages": [
@@ -189,7 +202,7 @@ Respond in JSON format:
         }
         
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=10)
+            response = self._session.post(url, json=payload, timeout=10)
             response.raise_for_status()
             
             result = response.json()
@@ -22,8 +22,10 @@ SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 supabase: Client = None
 
 def init_supabase():
-    """Initialize Supabase client"""
+    """Initialize Supabase client (reused once connected, so callers share one connection pool)"""
     global supabase
+    if supabase is not None:
+        return supabase
     if not SUPABASE_URL or not SUPABASE_KEY:
         print("WARNING: Supabase credentials not configured. Using offline mode.")
         return None
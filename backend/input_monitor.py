@@ -29,6 +29,11 @@ class InputMonitor:
         
         # Event tracking
         self.events = deque(maxlen=1000)  # Last 1000 events
+        # Rolling 60s APM window: (timestamp, type) pairs plus running per-type counts,
+        # so APM reads only expire old entries instead of rescanning every event
+        self._window = deque()
+        self._window_counts = {'keyboard': 0, 'mouse_click': 0, 'mouse_scroll': 0}
+        self._lock = threading.Lock()  # keyboard and mouse listeners run on separate threads
         self.keyboard_events = 0
         self.mouse_events = 0
         self.scroll_events = 0
@@ -45,7 +50,7 @@ class InputMonitor:
         """Keyboard press event handler"""
         try:
             self.keyboard_events += 1
-            self.events.append({
+            self._record({
                 'type': 'keyboard',
                 'timestamp': time.time(),
                 'key': str(key)
@@ -58,7 +63,7 @@ class InputMonitor:
         """Mouse click event handler"""
         if pressed:  # Only count press, not release
             self.mouse_events += 1
-            self.events.append({
+            self._record({
                 'type': 'mouse_click',
                 'timestamp': time.time(),
                 'button': str(button)
@@ -68,13 +73,29 @@ class InputMonitor:
     def on_mouse_scroll(self, x, y, dx, dy):
         """Mouse scroll event handler"""
         self.scroll_events += 1
-        self.events.append({
+        self._record({
             'type': 'mouse_scroll',
             'timestamp': time.time(),
             'delta': dy
         })
         self._update_apm()
     
+    def _record(self, event: dict):
+        """Add an event to the history and the rolling APM window"""
+        with self._lock:
+            self.events.append(event)
+            self._window.append((event['timestamp'], event['type']))
+            self._window_counts[event['type']] += 1
+    
+    def _prune_window(self, now: float):
+        """Expire window events older than 60 seconds (caller holds the lock)"""
+        # Events arrive in time order, so only the left end can expire
+        one_minute_ago = now - 60
+        window = self._window
+        while window and window[0][0] <= one_minute_ago:
+            _, event_type = window.popleft()
+            self._window_counts[event_type] -= 1
+    
     def _update_apm(self):
         """Calculate current APM based on recent events"""
         now = time.time()
@@ -86,18 +107,18 @@ class InputMonitor:
         self.last_apm_update = now
         
         # Count events in last 60 seconds
-        one_minute_ago = now - 60
-        recent_events = [e for e in self.events if e['timestamp'] > one_minute_ago]
-        
-        self.current_apm = len(recent_events)
+        with self._lock:
+            self._prune_window(now)
+            self.current_apm = len(self._window)
+            counts = dict(self._window_counts)
         
         # Call callback if provided
         if self.callback:
             self.callback({
                 'apm': self.current_apm,
-                'keyboard_events': sum(1 for e in recent_events if e['type'] == 'keyboard'),
-                'mouse_events': sum(1 for e in recent_events if e['type'] == 'mouse_click'),
-                'scroll_events': sum(1 for e in recent_events if e['type'] == 'mouse_scroll')
+                'keyboard_events': counts['keyboard'],
+                'mouse_events': counts['mouse_click'],
+                'scroll_events': counts['mouse_scroll']
             })
     
     def get_apm(self) -> float:
@@ -109,15 +130,12 @@ class InputMonitor:
         Determine activity pattern based on APM and event types
         Returns: 'active', 'passive', or 'idle'
         """
-        now = time.time()
-        one_minute_ago = now - 60
-        recent_events = [e for e in self.events if e['timestamp'] > one_minute_ago]
-        
-        if not recent_events:
-            return 'idle'
-        
-        keyboard_count = sum(1 for e in recent_events if e['type'] == 'keyboard')
-        scroll_count = sum(1 for e in recent_events if e['type'] == 'mouse_scroll')
+        with self._lock:
+            self._prune_window(time.time())
+            if not self._window:
+                return 'idle'
+            keyboard_count = self._window_counts['keyboard']
+            scroll_count = self._window_counts['mouse_scroll']
         
         # High keyboard activity = active work
         if keyboard_count > 30:
@@ -5,10 +5,12 @@ Replaces cloud dependency with privacy-first local learning.
 """
 
 import sqlite3
+import threading
 import json
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 import logging
 
 logger = logging.getLogger("FlowEngine.LocalDB")
@@ -16,19 +18,55 @@ logger = logging.getLogger("FlowEngine.LocalDB")
 # Database path
 DB_PATH = Path(__file__).parent.parent / "flow_patterns.db"
 
+# Older SQLite builds cap bound parameters per statement at 999
+SQLITE_MAX_VARIABLES = 999
+
+def _multi_insert(conn: sqlite3.Connection, table: str, cols: Tuple[str, ...], rows: List[tuple]):
+    """Insert rows with multi-row VALUES statements (parsed once per chunk, not once per row)"""
+    placeholders = "(" + ", ".join("?" * len(cols)) + ")"
+    chunk = max(1, SQLITE_MAX_VARIABLES // len(cols))
+    for i in range(0, len(rows), chunk):
+        batch = rows[i:i + chunk]
+        conn.execute(
+            f"INSERT INTO {table} ({', '.join(cols)}) VALUES " + ", ".join([placeholders] * len(batch)),
+            [value for row in batch for value in row]
+        )
+
 class LocalDatabase:
     """Local SQLite database for pattern storage"""
     
-    def __init__(self, db_path: Path = DB_PATH):
+    def __init__(self, db_path: Union[Path, str] = DB_PATH, fast: bool = False,
+                 template: Optional["LocalDatabase"] = None):
+        # ":memory:" gives a private in-memory database (used by the tests).
+        # fast=True turns off fsync entirely - only for throwaway databases.
+        # template: copy an initialized database's schema and rows instead of running the DDL.
         self.db_path = db_path
+        self.fast = fast
         self.conn = None
-        self._init_db()
+        self._tx_depth = 0  # open transaction() blocks; per-call commits are deferred while > 0
+        # The connection is shared across threads (get_db()); writers hold this lock so
+        # one thread's write can't land inside (and be rolled back with) another's transaction
+        self._lock = threading.RLock()
+        self._init_db(template)
     
-    def _init_db(self):
+    def _init_db(self, template: Optional["LocalDatabase"] = None):
         """Initialize database and create tables"""
-        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        # sqlite3 reuses prepared statements keyed by SQL text; size the cache so every
+        # statement here (incl. update_session's per-field-set variants) stays prepared
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, cached_statements=256)
         self.conn.row_factory = sqlite3.Row
         
+        # WAL + synchronous=NORMAL avoids an fsync per commit while staying crash-safe
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={'OFF' if self.fast else 'NORMAL'}")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+        
+        if template is not None:
+            template.conn.backup(self.conn)
+            logger.info(f"Database initialized at {self.db_path} from template")
+            return
+        
         cursor = self.conn.cursor()
         
         # Sessions table
@@ -99,19 +137,57 @@ class LocalDatabase:
         self.conn.commit()
         logger.info(f"Database initialized at {self.db_path}")
     
+    # ========================================================================
+    # TRANSACTIONS
+    # ========================================================================
+    
+    @contextmanager
+    def transaction(self):
+        """Group several writes into a single commit (rolled back on error)"""
+        with self._lock:
+            if self._tx_depth == 0 and not self.conn.in_transaction:
+                self.conn.execute("BEGIN")
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if self._tx_depth == 0:
+                    self.conn.rollback()
+                raise
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                self.conn.commit()
+    
+    def _commit(self):
+        """Commit now unless an enclosing transaction() will"""
+        with self._lock:
+            if self._tx_depth == 0:
+                self.conn.commit()
+    
     # ========================================================================
     # SESSION MANAGEMENT
     # ========================================================================
     
     def create_session(self, start_time: datetime) -> int:
         """Create a new session and return its ID"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO sessions (start_time)
-            VALUES (?)
-        """, (start_time,))
-        self.conn.commit()
-        return cursor.lastrowid
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                INSERT INTO sessions (start_time)
+                VALUES (?)
+            """, (start_time,))
+            self._commit()
+            return cursor.lastrowid
+    
+    def seed_sessions(self, rows: Iterable[Tuple[datetime, datetime, int, float, int]]):
+        """Bulk-insert finished sessions: (start_time, end_time, duration_seconds, focus_score, distraction_count)"""
+        with self.transaction():
+            _multi_insert(
+                self.conn, "sessions",
+                ("start_time", "end_time", "duration_seconds", "focus_score", "distraction_count"),
+                list(rows)
+            )
     
     def update_session(self, session_id: int, data: Dict):
         """Update session with end data"""
@@ -124,13 +200,14 @@ class LocalDatabase:
         
         values.append(session_id)
         
-        cursor = self.conn.cursor()
-        cursor.execute(f"""
-            UPDATE sessions
-            SET {', '.join(fields)}
-            WHERE id = ?
-        """, values)
-        self.conn.commit()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(f"""
+                UPDATE sessions
+                SET {', '.join(fields)}
+                WHERE id = ?
+            """, values)
+            self._commit()
     
     def get_recent_sessions(self, limit: int = 10) -> List[Dict]:
         """Get recent sessions"""
@@ -146,31 +223,50 @@ class LocalDatabase:
     # APP PATTERN TRACKING
     # ========================================================================
     
-    def log_app_usage(self, app_name: str, duration_seconds: int, 
-                      is_productive: bool = False, broke_flow: bool = False):
-        """Log app usage and update patterns"""
-        cursor = self.conn.cursor()
-        
-        # Get or create app pattern
-        cursor.execute("""
-            INSERT INTO app_patterns (app_name, total_time_seconds, last_used)
-            VALUES (?, ?, ?)
-            ON CONFLICT(app_name) DO UPDATE SET
-                total_time_seconds = total_time_seconds + ?,
-                flow_breaks = flow_breaks + ?,
-                productive_sessions = productive_sessions + ?,
-                distraction_sessions = distraction_sessions + ?,
-                last_used = ?,
-                updated_at = CURRENT_TIMESTAMP
-        """, (
-            app_name, duration_seconds, datetime.now(),
+    _APP_USAGE_UPSERT = """
+        INSERT INTO app_patterns (app_name, total_time_seconds, last_used)
+        VALUES (?, ?, ?)
+        ON CONFLICT(app_name) DO UPDATE SET
+            total_time_seconds = total_time_seconds + ?,
+            flow_breaks = flow_breaks + ?,
+            productive_sessions = productive_sessions + ?,
+            distraction_sessions = distraction_sessions + ?,
+            last_used = ?,
+            updated_at = CURRENT_TIMESTAMP
+    """
+    
+    @staticmethod
+    def _app_usage_params(app_name: str, duration_seconds: int,
+                          is_productive: bool = False, broke_flow: bool = False) -> tuple:
+        now = datetime.now()
+        return (
+            app_name, duration_seconds, now,
             duration_seconds,
             1 if broke_flow else 0,
             1 if is_productive else 0,
             1 if not is_productive else 0,
-            datetime.now()
-        ))
-        self.conn.commit()
+            now
+        )
+    
+    def log_app_usage(self, app_name: str, duration_seconds: int, 
+                      is_productive: bool = False, broke_flow: bool = False):
+        """Log app usage and update patterns"""
+        with self._lock:
+            cursor = self.conn.cursor()
+            
+            # Get or create app pattern
+            cursor.execute(self._APP_USAGE_UPSERT, self._app_usage_params(
+                app_name, duration_seconds, is_productive, broke_flow
+            ))
+            self._commit()
+    
+    def log_app_usage_many(self, rows: Iterable[Tuple[str, int, bool, bool]]):
+        """Log many (app_name, duration_seconds, is_productive, broke_flow) rows in one transaction"""
+        with self.transaction():
+            self.conn.executemany(
+                self._APP_USAGE_UPSERT,
+                [self._app_usage_params(*row) for row in rows]
+            )
     
     def get_app_patterns(self, limit: int = 20) -> List[Dict]:
         """Get app usage patterns sorted by total time"""
@@ -195,13 +291,14 @@ class LocalDatabase:
     
     def auto_block_app(self, app_name: str):
         """Mark app as auto-blocked due to repeated flow breaks"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            UPDATE app_patterns
-            SET auto_blocked = 1, is_blocked = 1, updated_at = CURRENT_TIMESTAMP
-            WHERE app_name = ?
-        """, (app_name,))
-        self.conn.commit()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                UPDATE app_patterns
+                SET auto_blocked = 1, is_blocked = 1, updated_at = CURRENT_TIMESTAMP
+                WHERE app_name = ?
+            """, (app_name,))
+            self._commit()
         logger.info(f"Auto-blocked app: {app_name}")
     
     # ========================================================================
@@ -211,19 +308,20 @@ class LocalDatabase:
     def log_flow_window(self, date: datetime, hour: int, 
                         flow_quality: float, apm: float, duration_minutes: int):
         """Log flow quality for a specific time window"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO flow_windows (date, hour, flow_quality, apm_average, duration_minutes)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(date, hour) DO UPDATE SET
-                flow_quality = (flow_quality + ?) / 2,
-                apm_average = (apm_average + ?) / 2,
-                duration_minutes = duration_minutes + ?
-        """, (
-            date.date(), hour, flow_quality, apm, duration_minutes,
-            flow_quality, apm, duration_minutes
-        ))
-        self.conn.commit()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                INSERT INTO flow_windows (date, hour, flow_quality, apm_average, duration_minutes)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(date, hour) DO UPDATE SET
+                    flow_quality = (flow_quality + ?) / 2,
+                    apm_average = (apm_average + ?) / 2,
+                    duration_minutes = duration_minutes + ?
+            """, (
+                date.date(), hour, flow_quality, apm, duration_minutes,
+                flow_quality, apm, duration_minutes
+            ))
+            self._commit()
     
     def get_peak_flow_hours(self, days: int = 30) -> List[int]:
         """Get hours of day with highest flow quality"""
@@ -247,13 +345,14 @@ class LocalDatabase:
                      activity_type: str, apm: float, fatigue_score: float,
                      url: Optional[str] = None):
         """Log detailed activity"""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            INSERT INTO activity_log 
-            (session_id, timestamp, app_name, url, activity_type, apm, fatigue_score)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (session_id, datetime.now(), app_name, url, activity_type, apm, fatigue_score))
-        self.conn.commit()
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute("""
+                INSERT INTO activity_log 
+                (session_id, timestamp, app_name, url, activity_type, apm, fatigue_score)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (session_id, datetime.now(), app_name, url, activity_type, apm, fatigue_score))
+            self._commit()
     
     def close(self):
         """Close database connection"""
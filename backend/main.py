@@ -450,62 +450,110 @@ def _broadcast_settings_change():
     except Exception as e:
         logger.warning(f"Failed to broadcast setting change: {e}")
 
+def _cached_ps_script(name: str, body: str) -> str:
+    """Persist a PowerShell script under %LOCALAPPDATA%\\flow (rewritten only when stale)"""
+    import tempfile
+    script_dir = os.path.join(os.environ.get("LOCALAPPDATA") or tempfile.gettempdir(), "flow")
+    os.makedirs(script_dir, exist_ok=True)
+    script_path = os.path.join(script_dir, name)
+    try:
+        with open(script_path, "r", encoding="utf-8") as f:
+            stale = f.read() != body
+    except OSError:
+        stale = True
+    if stale:
+        with open(script_path, "w", encoding="utf-8") as f:
+            f.write(body)
+    return script_path
+
+# HKCU keys written on every DND toggle; handles are kept open and reopened only if they go stale
+_NOTIF_KEY = r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings"
+_QH_KEY = r"Software\Microsoft\Windows\CurrentVersion\QuietHours"
+_dnd_key_handles = {}
+
+def _dnd_key(path: str):
+    """Cached read/write handle to an HKCU key (created if missing)"""
+    key = _dnd_key_handles.get(path)
+    if key is None:
+        key = winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER, path, 0, winreg.KEY_READ | winreg.KEY_WRITE)
+        _dnd_key_handles[path] = key
+    return key
+
+def _with_dnd_key(path: str, op):
+    """Run op(key) on the cached handle; if the key went stale (e.g. deleted), reopen it once and retry"""
+    try:
+        return op(_dnd_key(path))
+    except FileNotFoundError:
+        raise  # Missing value, not a dead handle
+    except OSError:
+        stale = _dnd_key_handles.pop(path, None)
+        if stale is not None:
+            try:
+                winreg.CloseKey(stale)
+            except OSError:
+                pass
+        return op(_dnd_key(path))
+
+def _dnd_query(path: str, name: str):
+    return _with_dnd_key(path, lambda key: winreg.QueryValueEx(key, name))
+
+def _dnd_set(path: str, name: str, value: int):
+    _with_dnd_key(path, lambda key: winreg.SetValueEx(key, name, 0, winreg.REG_DWORD, value))
+
+def _powershell_exe() -> str:
+    """Prefer PowerShell 7 (pwsh) when installed; it starts noticeably faster"""
+    import shutil
+    return shutil.which("pwsh") or "powershell"
+
 def enable_dnd():
     try:
         if platform.system() == 'Windows' and winreg:
             # Disable toast notifications
-            notif_key = r"Software\\Microsoft\\Windows\\CurrentVersion\\Notifications\\Settings"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, notif_key) as key:
-                try:
-                    prev, _ = winreg.QueryValueEx(key, "NOC_GLOBAL_SETTING_TOASTS_ENABLED")
-                    state.dnd_prev_value = int(prev)
-                except FileNotFoundError:
-                    state.dnd_prev_value = None
-                winreg.SetValueEx(key, "NOC_GLOBAL_SETTING_TOASTS_ENABLED", 0, winreg.REG_DWORD, 0)
+            try:
+                prev, _ = _dnd_query(_NOTIF_KEY, "NOC_GLOBAL_SETTING_TOASTS_ENABLED")
+                state.dnd_prev_value = int(prev)
+            except FileNotFoundError:
+                state.dnd_prev_value = None
+            _dnd_set(_NOTIF_KEY, "NOC_GLOBAL_SETTING_TOASTS_ENABLED", 0)
             # Enable Focus Assist: 0=Off, 1=Priority only, 2=Alarms only
-            qh_key = r"Software\\Microsoft\\Windows\\CurrentVersion\\QuietHours"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, qh_key) as key:
-                try:
-                    prev_fa, _ = winreg.QueryValueEx(key, "FocusAssist")
-                    state.focus_assist_prev_value = int(prev_fa)
-                except FileNotFoundError:
-                    state.focus_assist_prev_value = None
-                winreg.SetValueEx(key, "FocusAssist", 0, winreg.REG_DWORD, 2)
+            try:
+                prev_fa, _ = _dnd_query(_QH_KEY, "FocusAssist")
+                state.focus_assist_prev_value = int(prev_fa)
+            except FileNotFoundError:
+                state.focus_assist_prev_value = None
+            _dnd_set(_QH_KEY, "FocusAssist", 2)
             # Read-back verification
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, qh_key, 0, winreg.KEY_READ) as key:
-                val, _ = winreg.QueryValueEx(key, "FocusAssist")
-                if val == 2:
-                    logger.info("[OK] Windows Focus Assist verified: 2 (Alarms only)")
-                else:
-                    logger.warning(f"[WARNING] Focus Assist verification failed. Expected 2, got {val}")
+            val, _ = _dnd_query(_QH_KEY, "FocusAssist")
+            if val == 2:
+                logger.info("[OK] Windows Focus Assist verified: 2 (Alarms only)")
+            else:
+                logger.warning(f"[WARNING] Focus Assist verification failed. Expected 2, got {val}")
             
             # Verify toast setting
-            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, notif_key, 0, winreg.KEY_READ) as key:
-                try:
-                    toast_val, _ = winreg.QueryValueEx(key, "NOC_GLOBAL_SETTING_TOASTS_ENABLED")
-                    if toast_val == 0:
-                        logger.info("[OK] Toast notifications verified: disabled")
-                    else:
-                        logger.warning(f"[WARNING] Toast setting verification failed. Expected 0, got {toast_val}")
-                except FileNotFoundError:
-                    logger.warning("[WARNING] Could not verify toast setting")
+            try:
+                toast_val, _ = _dnd_query(_NOTIF_KEY, "NOC_GLOBAL_SETTING_TOASTS_ENABLED")
+                if toast_val == 0:
+                    logger.info("[OK] Toast notifications verified: disabled")
+                else:
+                    logger.warning(f"[WARNING] Toast setting verification failed. Expected 0, got {toast_val}")
+            except FileNotFoundError:
+                logger.warning("[WARNING] Could not verify toast setting")
             
             _broadcast_settings_change()
             
             # Method 2: Set additional notification registry keys
             try:
                 # Disable banner notifications
-                with winreg.CreateKey(winreg.HKEY_CURRENT_USER, notif_key) as key:
-                    try:
-                        winreg.SetValueEx(key, "NOC_GLOBAL_SETTING_BANNER_ENABLED", 0, winreg.REG_DWORD, 0)
-                        logger.info("Banner notifications disabled")
-                    except:
-                        pass
-                    try:
-                        winreg.SetValueEx(key, "NOC_GLOBAL_SETTING_SOUND_ENABLED", 0, winreg.REG_DWORD, 0)
-                        logger.info("Notification sounds disabled")
-                    except:
-                        pass
+                try:
+                    _dnd_set(_NOTIF_KEY, "NOC_GLOBAL_SETTING_BANNER_ENABLED", 0)
+                    logger.info("Banner notifications disabled")
+                except:
+                    pass
+                try:
+                    _dnd_set(_NOTIF_KEY, "NOC_GLOBAL_SETTING_SOUND_ENABLED", 0)
+                    logger.info("Notification sounds disabled")
+                except:
+                    pass
             except Exception as e:
                 logger.warning(f"Additional notification settings failed: {e}")
             
@@ -523,17 +571,8 @@ def enable_dnd():
                 Set-ItemProperty -Path $notifPath -Name "NOC_GLOBAL_SETTING_BANNER_ENABLED" -Value 0 -Type DWord -Force -ErrorAction SilentlyContinue
                 Set-ItemProperty -Path $notifPath -Name "NOC_GLOBAL_SETTING_SOUND_ENABLED" -Value 0 -Type DWord -Force -ErrorAction SilentlyContinue
                 
-                # Restart notification-related processes
-                $processes = @("ShellExperienceHost", "RuntimeBroker")
-                foreach ($proc in $processes) {
-                    try {
-                        $procs = Get-Process -Name $proc -ErrorAction SilentlyContinue
-                        if ($procs) {
-                            $procs | Stop-Process -Force -ErrorAction SilentlyContinue
-                            Start-Sleep -Milliseconds 500
-                        }
-                    } catch {}
-                }
+                # Restart notification-related processes (one lookup, no per-process sleep)
+                Get-Process -Name @("ShellExperienceHost", "RuntimeBroker") -ErrorAction SilentlyContinue | Stop-Process -Force -ErrorAction SilentlyContinue
                 
                 # Broadcast settings change using Windows API
                 $code = @'
@@ -552,8 +591,10 @@ def enable_dnd():
                 
                 Write-Output "DND activation complete"
                 '''
+                # Run from a cached .ps1 with -NoProfile: skips profile load and -Command re-parsing
+                script_path = _cached_ps_script("enable_dnd.ps1", ps_command)
                 result = subprocess.run(
-                    ["powershell", "-ExecutionPolicy", "Bypass", "-Command", ps_command],
+                    [_powershell_exe(), "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", script_path],
                     capture_output=True,
                     text=True,
                     timeout=15,
@@ -574,12 +615,7 @@ def enable_dnd():
             
             # Method 4: Open Windows Settings for manual verification/activation
             try:
-                import subprocess
-                subprocess.Popen(
-                    ["ms-settings:quiethours"],
-                    shell=True,
-                    creationflags=subprocess.CREATE_NO_WINDOW
-                )
+                os.startfile("ms-settings:quiethours")  # ShellExecute directly, no cmd.exe
                 logger.info("[ACTION REQUIRED] Windows Settings opened - Please verify Focus Assist is set to 'Alarms only'")
             except Exception as e:
                 logger.warning(f"Could not open Windows Settings: {e}")
@@ -604,14 +640,10 @@ def enable_dnd():
 def disable_dnd():
     try:
         if platform.system() == 'Windows' and winreg:
-            notif_key = r"Software\\Microsoft\\Windows\\CurrentVersion\\Notifications\\Settings"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, notif_key) as key:
-                value = 1 if state.dnd_prev_value is None else int(state.dnd_prev_value)
-                winreg.SetValueEx(key, "NOC_GLOBAL_SETTING_TOASTS_ENABLED", 0, winreg.REG_DWORD, value)
-            qh_key = r"Software\\Microsoft\\Windows\\CurrentVersion\\QuietHours"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, qh_key) as key:
-                value = 0 if state.focus_assist_prev_value is None else int(state.focus_assist_prev_value)
-                winreg.SetValueEx(key, "FocusAssist", 0, winreg.REG_DWORD, value)
+            value = 1 if state.dnd_prev_value is None else int(state.dnd_prev_value)
+            _dnd_set(_NOTIF_KEY, "NOC_GLOBAL_SETTING_TOASTS_ENABLED", value)
+            value = 0 if state.focus_assist_prev_value is None else int(state.focus_assist_prev_value)
+            _dnd_set(_QH_KEY, "FocusAssist", value)
             _broadcast_settings_change()
             logger.info("Windows DND restored (toasts & Focus Assist)")
     except Exception as e:
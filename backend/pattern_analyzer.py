@@ -6,8 +6,8 @@ Implements AI-driven learning without cloud dependencies.
 
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple
-from local_db import get_db
+from typing import List, Dict, Tuple, Optional
+from local_db import LocalDatabase, get_db
 
 logger = logging.getLogger("FlowEngine.PatternAnalyzer")
 
@@ -22,8 +22,9 @@ class PatternAnalyzer:
     - Auto-adjust blocking rules
     """
     
-    def __init__(self):
-        self.db = get_db()
+    def __init__(self, db: Optional[LocalDatabase] = None):
+        # Defaults to the shared on-disk database; tests pass their own (e.g. ":memory:")
+        self.db = db if db is not None else get_db()
     
     # ========================================================================
     # APP PATTERN ANALYSIS
@@ -269,10 +270,34 @@ class PatternAnalyzer:
         Returns:
             Dict with learned patterns, stats, and recommendations
         """
+        return self._build_learning_summary(
+            self.analyze_app_patterns(),
+            self.detect_biological_patterns(),
+            self.calculate_optimal_threshold()
+        )
+    
+    def analyze_all(self) -> Dict:
+        """
+        Run every analysis once and derive the learning summary from those results.
+        
+        Cheaper than calling each analysis and then get_learning_summary(),
+        which would repeat all three.
+        
+        Returns:
+            Dict with app_patterns, bio, threshold, and summary
+        """
         app_analysis = self.analyze_app_patterns()
         bio_patterns = self.detect_biological_patterns()
         optimal_threshold = self.calculate_optimal_threshold()
-        
+        return {
+            'app_patterns': app_analysis,
+            'bio': bio_patterns,
+            'threshold': optimal_threshold,
+            'summary': self._build_learning_summary(app_analysis, bio_patterns, optimal_threshold)
+        }
+    
+    def _build_learning_summary(self, app_analysis: Dict, bio_patterns: Dict,
+                                optimal_threshold: int) -> Dict:
         # Get session stats
         cursor = self.db.conn.cursor()
         cursor.execute("""
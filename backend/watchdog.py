@@ -7,23 +7,80 @@ Does NOT automatically restart - user must restart manually.
 import os
 import sys
 import time
+import signal
+import threading
+import logging
+import logging.handlers
 import psutil
 import requests
 from pathlib import Path
 from datetime import datetime
 
+logger = logging.getLogger("FlowEngine.Watchdog")
+
+# Adaptive heartbeat: back off while the server stays healthy, probe rapidly on failure
+HEARTBEAT_MIN = 1  # seconds
+HEARTBEAT_DEFAULT = 10  # seconds
+HEARTBEAT_MAX = 60  # seconds
+HEARTBEAT_BACKOFF = 1.5
+HEALTHY_STREAK_FOR_BACKOFF = 3
+WAIT_SLICE = 0.5  # seconds; upper bound on shutdown latency
+
 class Watchdog:
     def __init__(self):
         self.main_script = Path(__file__).parent / "main.py"
         self.main_process = None
-        self.heartbeat_interval = 10  # seconds
+        self.heartbeat_interval = HEARTBEAT_DEFAULT  # seconds
         self.last_health_check = None
         self.was_healthy_before_death = False
+        self._healthy_streak = 0
+        self._stop_event = threading.Event()
         
-    def log(self, message: str):
-        """Log with timestamp"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        print(f"[{timestamp}] 🐕 WATCHDOG: {message}")
+    def log(self, message: str, level: int = logging.INFO):
+        """Log with timestamp (formatting is deferred to the logging handler)"""
+        logger.log(level, message)
+    
+    def stop(self, *_):
+        """Wake the monitoring loop immediately and make it exit"""
+        self._stop_event.set()
+    
+    def _wait(self, seconds: float) -> bool:
+        """Sleep (on the monotonic clock) unless a stop is requested; returns True if stopping"""
+        # Wait in short slices: Event.wait isn't signal-interruptible on Windows,
+        # so a single long wait would delay Ctrl+C until the heartbeat expires
+        self._flush_logs()
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return self._stop_event.is_set()
+            if self._stop_event.wait(min(WAIT_SLICE, remaining)):
+                return True
+    
+    def _flush_logs(self):
+        """Write out buffered log records before going idle, so each heartbeat cycle shows up promptly"""
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+    
+    def _record_probe(self, healthy: bool):
+        """Adapt heartbeat interval: widen after a healthy streak, collapse on failure"""
+        if healthy:
+            self._healthy_streak += 1
+            if self._healthy_streak >= HEALTHY_STREAK_FOR_BACKOFF:
+                self.heartbeat_interval = min(HEARTBEAT_MAX, self.heartbeat_interval * HEARTBEAT_BACKOFF)
+        else:
+            self._healthy_streak = 0
+            self.heartbeat_interval = HEARTBEAT_MIN
+    
+    def _wait_for_main_process(self, message: str) -> bool:
+        """Poll until main.py shows up; returns False if asked to stop first"""
+        while not self._wait(5):
+            existing_process = self.find_main_process()
+            if existing_process:
+                self.log(f"{message} (PID: {existing_process.pid})")
+                self.main_process = existing_process
+                return True
+        return False
     
     def is_process_running(self, pid: int) -> bool:
         """Check if a process is running by PID"""
@@ -56,9 +113,9 @@ class Watchdog:
             if response.status_code == 200:
                 self.log("✅ Resilience penalty applied (-15 points)")
             else:
-                self.log(f"⚠️  Failed to apply penalty: {response.status_code}")
+                self.log(f"⚠️  Failed to apply penalty: {response.status_code}", logging.WARNING)
         except Exception as e:
-            self.log(f"⚠️  Could not apply penalty (backend may be down): {e}")
+            self.log(f"⚠️  Could not apply penalty (backend may be down): {e}", logging.WARNING)
     
     def check_health(self) -> bool:
         """Check if main server is healthy via HTTP health endpoint"""
@@ -72,75 +129,98 @@ class Watchdog:
         """Main monitoring loop - monitors only, does not restart"""
         self.log("🚀 Watchdog started (monitoring only - no auto-restart)")
         
+        # Wake the loop instantly on shutdown instead of waiting out the heartbeat
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                signal.signal(sig, self.stop)
+            except (ValueError, OSError):
+                pass  # Not on the main thread
+        
+        try:
+            self._monitor_loop()
+        except KeyboardInterrupt:
+            self.stop()
+        
+        self.log("⚠️  Received interrupt signal. Shutting down...")
+    
+    def _monitor_loop(self):
+        """Watch the main server until a stop is requested"""
         # Find the main server process
         existing_process = self.find_main_process()
         if existing_process:
             self.log(f"Found main server (PID: {existing_process.pid})")
             self.main_process = existing_process
         else:
-            self.log("⚠️  Main server not found. Please start it manually.")
+            self.log("⚠️  Main server not found. Please start it manually.", logging.WARNING)
             self.log("   Waiting for main server to start...")
             # Wait for user to start the server
-            while True:
-                time.sleep(5)
-                existing_process = self.find_main_process()
-                if existing_process:
-                    self.log(f"✅ Main server detected (PID: {existing_process.pid})")
-                    self.main_process = existing_process
-                    break
+            if not self._wait_for_main_process("✅ Main server detected"):
+                return
         
         # Monitoring loop
-        while True:
+        while not self._wait(self.heartbeat_interval):
             try:
-                time.sleep(self.heartbeat_interval)
-                
                 # Check if process is still running
                 if self.main_process and self.is_process_running(self.main_process.pid):
                     # Process exists, check health
                     if self.check_health():
-                        self.log(f"✅ Heartbeat OK (PID: {self.main_process.pid})")
+                        self._record_probe(True)
+                        self.log(f"✅ Heartbeat OK (PID: {self.main_process.pid}, next in {self.heartbeat_interval:.0f}s)")
                         self.was_healthy_before_death = True
                         self.last_health_check = datetime.now()
                     else:
-                        self.log(f"⚠️  Process running but health check failed")
+                        self._record_probe(False)
+                        self.log(f"⚠️  Process running but health check failed", logging.WARNING)
                         self.was_healthy_before_death = False
                 else:
                     # Process died
-                    self.log("💀 Main server process died!")
+                    self._record_probe(False)
+                    self.log("💀 Main server process died!", logging.WARNING)
                     
                     # Check if it was a forceful kill (was healthy before death)
                     if self.was_healthy_before_death:
-                        self.log("🚨 Detected forceful termination (app was healthy before death)")
+                        self.log("🚨 Detected forceful termination (app was healthy before death)", logging.WARNING)
                         # Wait a moment for backend to potentially come back
-                        time.sleep(3)
+                        if self._wait(3):
+                            break
                         # Try to apply penalty
                         self.apply_resilience_penalty()
                     
                     # Do NOT restart - just log and wait for manual restart
-                    self.log("⚠️  Watchdog will NOT auto-restart. Please restart the server manually.")
+                    self.log("⚠️  Watchdog will NOT auto-restart. Please restart the server manually.", logging.WARNING)
                     self.log("   Waiting for manual restart...")
                     
                     # Wait for user to restart
                     self.main_process = None
                     self.was_healthy_before_death = False
                     
-                    while True:
-                        time.sleep(5)
-                        existing_process = self.find_main_process()
-                        if existing_process:
-                            self.log(f"✅ Main server restarted manually (PID: {existing_process.pid})")
-                            self.main_process = existing_process
-                            break
-                
-            except KeyboardInterrupt:
-                self.log("⚠️  Received interrupt signal. Shutting down...")
-                break
+                    if not self._wait_for_main_process("✅ Main server restarted manually"):
+                        break
             
             except Exception as e:
-                self.log(f"❌ Error in monitoring loop: {e}")
-                time.sleep(5)
+                self.log(f"❌ Error in monitoring loop: {e}", logging.ERROR)
+                self._record_probe(False)
+                if self._wait(5):
+                    break
 
 if __name__ == "__main__":
+    # Buffer the records of each heartbeat cycle and write them in one batch
+    # when the watchdog goes idle; anything at WARNING or above flushes the
+    # buffer immediately so problems are never delayed.
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(
+        "[%(asctime)s] 🐕 WATCHDOG: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
+    ))
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[logging.handlers.MemoryHandler(
+            capacity=32,
+            flushLevel=logging.WARNING,
+            target=stream_handler
+        )]
+    )
+    
     print("=" * 60)
     print("🐕 Flow State Facilitator - Watchdog Monitor")
     print("   (Monitoring Only - No Auto-Restart)")
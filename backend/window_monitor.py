@@ -4,6 +4,7 @@ Windows API integration for tracking active windows and creating overlay blocks.
 """
 
 import time
+import asyncio
 import threading
 from typing import Optional, Callable
 
@@ -27,6 +28,7 @@ class WindowMonitor:
         self.callback = callback
         self.monitoring = False
         self.monitor_thread = None
+        self.monitor_task = None
         self.current_window = None
         self.current_process = None
         
@@ -61,40 +63,68 @@ class WindowMonitor:
             return None
     
     def start_monitoring(self, interval: float = 2.0):
-        """Start monitoring active window in background thread"""
+        """Start monitoring active window.
+        
+        Inside a running event loop (the FastAPI backend) this schedules a task on
+        that loop; standalone CLI use falls back to a background thread.
+        """
         if self.monitoring:
             return
         
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, args=(interval,), daemon=True)
-        self.monitor_thread.start()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        
+        if loop is not None:
+            self.monitor_task = loop.create_task(self._async_loop(interval))
+        else:
+            self.monitor_thread = threading.Thread(target=self._monitor_loop, args=(interval,), daemon=True)
+            self.monitor_thread.start()
         print("🔍 Window monitoring started")
     
     def stop_monitoring(self):
         """Stop monitoring"""
         self.monitoring = False
+        if self.monitor_task:
+            self.monitor_task.cancel()
+            self.monitor_task = None
         if self.monitor_thread:
             self.monitor_thread.join(timeout=5)
         print("🛑 Window monitoring stopped")
     
+    def _handle_window(self, window_info: Optional[dict]):
+        """Fire the callback if the foreground window changed"""
+        if window_info:
+            # Check if window changed
+            if (not self.current_window or 
+                window_info["title"] != self.current_window.get("title")):
+                
+                self.current_window = window_info
+                self.current_process = window_info["process_name"]
+                
+                # Call callback if provided
+                if self.callback:
+                    self.callback(window_info)
+    
+    async def _async_loop(self, interval: float):
+        """Event-loop monitoring task; the Win32 query runs in the default executor"""
+        while self.monitoring:
+            try:
+                window_info = await asyncio.to_thread(self.get_active_window_info)
+                self._handle_window(window_info)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error in monitor loop: {e}")
+            await asyncio.sleep(interval)
+    
     def _monitor_loop(self, interval: float):
         """Background monitoring loop"""
         while self.monitoring:
             try:
-                window_info = self.get_active_window_info()
-                
-                if window_info:
-                    # Check if window changed
-                    if (not self.current_window or 
-                        window_info["title"] != self.current_window.get("title")):
-                        
-                        self.current_window = window_info
-                        self.current_process = window_info["process_name"]
-                        
-                        # Call callback if provided
-                        if self.callback:
-                            self.callback(window_info)
-                
+                self._handle_window(self.get_active_window_info())
                 time.sleep(interval)
                 
             except Exception as e:
@@ -0,0 +1,28 @@
+"""Registry helpers shared by the DND test scripts"""
+import winreg
+import time
+
+def read_dwords(path, names):
+    """Read several values from one key with a single open; missing values map to None"""
+    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, path, 0, winreg.KEY_READ | winreg.KEY_WOW64_64KEY) as key:
+        values = {}
+        for name in names:
+            try:
+                values[name] = winreg.QueryValueEx(key, name)[0]
+            except FileNotFoundError:
+                values[name] = None
+        return values
+
+
+def wait_for_dword(path, name, expected, timeout):
+    """Poll until the value reads back as expected (or timeout); returns whether it did"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if read_dwords(path, [name])[name] == expected:
+                return True
+        except OSError:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.05)
@@ -12,13 +12,19 @@ import logging
 import traceback
 from pathlib import Path
 
-# Setup logging immediately
 LOG_FILE = Path(__file__).parent / "bridge.log"
-logging.basicConfig(
-    filename=str(LOG_FILE),
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+
+def setup_logging():
+    """Log to bridge.log (stdout is the native messaging channel, so never log there)"""
+    logging.basicConfig(
+        filename=str(LOG_FILE),
+        level=logging.DEBUG,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+
+# Native messaging length header: 4-byte unsigned int in native byte order.
+# Precompiled once so framing doesn't re-parse the format on every message.
+_HEADER = struct.Struct('=I')
 
 def setup_windows_binary_mode():
     """Set binary mode for Windows stdio"""
@@ -35,7 +41,7 @@ def send_message(message: dict):
     """Send message to Chrome extension using native messaging protocol"""
     try:
         encoded_message = json.dumps(message).encode('utf-8')
-        message_length = struct.pack('I', len(encoded_message))
+        message_length = _HEADER.pack(len(encoded_message))
         
         # Write to stdout in binary mode
         sys.stdout.buffer.write(message_length)
@@ -56,7 +62,7 @@ def read_message():
             logging.info("No more messages (stdin closed)")
             return None
         
-        message_length = struct.unpack('I', raw_length)[0]
+        message_length = _HEADER.unpack(raw_length)[0]
         
         # Read message content
         message_bytes = sys.stdin.buffer.read(message_length)
@@ -69,10 +75,12 @@ def read_message():
         logging.error(f"Error reading message: {e}")
         return None
 
-def forward_to_fastapi(message: dict):
-    """Forward message to FastAPI server"""
+def forward_to_fastapi(message: dict, post=None):
+    """Forward message to FastAPI server (post: httpx.post-compatible callable, for tests)"""
     try:
-        import httpx
+        if post is None:
+            import httpx
+            post = httpx.post
         
         # Determine endpoint based on message type
         if message.get("type") == "browser_activity":
@@ -94,7 +102,7 @@ def forward_to_fastapi(message: dict):
             return {"status": "error", "message": "Unknown message type"}
         
         # Send to FastAPI
-        response = httpx.post(endpoint, json=data, timeout=5.0)
+        response = post(endpoint, json=data, timeout=5.0)
         result = response.json()
         
         logging.info(f"FastAPI response: {result}")
@@ -107,8 +115,14 @@ def forward_to_fastapi(message: dict):
         logging.error(f"Error forwarding to FastAPI: {e}")
         return {"status": "error", "message": str(e)}
 
+def handle_message(message: dict, post=None) -> dict:
+    """Turn one message from the extension into the response to send back"""
+    return forward_to_fastapi(message, post=post)
+
 def main():
     """Main bridge loop"""
+    # Setup logging immediately
+    setup_logging()
     logging.info("=" * 60)
     logging.info("🌉 Native Messaging Bridge Started")
     logging.info("=" * 60)
@@ -124,7 +138,7 @@ def main():
                 break
             
             # Forward to FastAPI and get response
-            response = forward_to_fastapi(message)
+            response = handle_message(message)
             
             # Send response back to Chrome
             send_message(response)
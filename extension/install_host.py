@@ -53,13 +53,15 @@ def install_native_host(ext_id: str | None = None):
     registry_path = r"Software\Google\Chrome\NativeMessagingHosts\com.flow.engine"
     
     try:
-        # Create/open registry key
-        key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, registry_path)
-        
-        # Set the default value to the manifest path
-        winreg.SetValue(key, "", winreg.REG_SZ, str(manifest_path))
-        
-        winreg.CloseKey(key)
+        # Create/open registry key and point its default value at the manifest (skipped if already set)
+        with winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER, registry_path, 0,
+                                winreg.KEY_QUERY_VALUE | winreg.KEY_SET_VALUE) as key:
+            try:
+                registered = winreg.QueryValueEx(key, "")[0]
+            except FileNotFoundError:
+                registered = None
+            if registered != str(manifest_path):
+                winreg.SetValueEx(key, "", 0, winreg.REG_SZ, str(manifest_path))
         
         print("=" * 70)
         print("✅ SUCCESS! Native messaging host registered!")
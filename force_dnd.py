@@ -2,10 +2,71 @@
 Force DND activation by opening Windows Focus Assist settings
 This allows user to manually verify/activate if registry changes aren't taking effect
 """
-import subprocess
+import ctypes
+from ctypes import wintypes
+from concurrent.futures import ThreadPoolExecutor
+import os
 import winreg
 import sys
 
+# Win32 process enumeration/termination (avoids spawning PowerShell)
+TH32CS_SNAPPROCESS = 0x00000002
+PROCESS_TERMINATE = 0x0001
+INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_void_p),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", ctypes.c_long),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", wintypes.WCHAR * 260),
+    ]
+
+k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+k32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+k32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+k32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+k32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+k32.OpenProcess.restype = wintypes.HANDLE
+k32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+k32.TerminateProcess.argtypes = [wintypes.HANDLE, wintypes.UINT]
+k32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+def find_pids(exe_names):
+    """Return PIDs of running processes whose image name is in exe_names"""
+    targets = {name.lower() for name in exe_names}
+    snapshot = k32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+    pids = []
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        ok = k32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while ok:
+            if entry.szExeFile.lower() in targets:
+                pids.append(entry.th32ProcessID)
+            ok = k32.Process32NextW(snapshot, ctypes.byref(entry))
+    finally:
+        k32.CloseHandle(snapshot)
+    return pids
+
+def terminate_pid(pid):
+    """Terminate a single process; returns True on success"""
+    handle = k32.OpenProcess(PROCESS_TERMINATE, False, pid)
+    if not handle:
+        return False
+    try:
+        return bool(k32.TerminateProcess(handle, 1))
+    finally:
+        k32.CloseHandle(handle)
+
 print("=" * 60)
 print("Force DND Activation")
 print("=" * 60)
@@ -16,57 +77,36 @@ qh_key = r"Software\Microsoft\Windows\CurrentVersion\QuietHours"
 notif_key = r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings"
 
 try:
-    with winreg.CreateKey(winreg.HKEY_CURRENT_USER, qh_key) as key:
+    with winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER, qh_key, 0, winreg.KEY_SET_VALUE) as key:
         winreg.SetValueEx(key, "FocusAssist", 0, winreg.REG_DWORD, 2)
     print("   [OK] Focus Assist set to 2 in registry")
 except Exception as e:
     print(f"   [ERROR] Failed to set Focus Assist: {e}")
 
 try:
-    with winreg.CreateKey(winreg.HKEY_CURRENT_USER, notif_key) as key:
+    with winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER, notif_key, 0, winreg.KEY_SET_VALUE) as key:
         winreg.SetValueEx(key, "NOC_GLOBAL_SETTING_TOASTS_ENABLED", 0, winreg.REG_DWORD, 0)
     print("   [OK] Toast notifications disabled in registry")
 except Exception as e:
     print(f"   [ERROR] Failed to disable toasts: {e}")
 
-# Step 2: Use PowerShell to force refresh
-print("\n2. Refreshing notification system via PowerShell...")
-ps_command = '''
-$path = "HKCU:\\Software\\Microsoft\\Windows\\CurrentVersion\\QuietHours"
-Set-ItemProperty -Path $path -Name "FocusAssist" -Value 2 -Type DWord -Force
-
-# Try to restart notification-related processes
-$processes = @("ShellExperienceHost", "RuntimeBroker")
-foreach ($proc in $processes) {
-    try {
-        Get-Process -Name $proc -ErrorAction SilentlyContinue | Stop-Process -Force -ErrorAction SilentlyContinue
-        Start-Sleep -Milliseconds 500
-    } catch {}
-}
-Write-Output "Notification system refreshed"
-'''
+# Step 2: Restart notification-related processes so they pick up the new values
+print("\n2. Refreshing notification system...")
 try:
-    result = subprocess.run(
-        ["powershell", "-Command", ps_command],
-        capture_output=True,
-        text=True,
-        timeout=10,
-        creationflags=subprocess.CREATE_NO_WINDOW
-    )
-    print(f"   PowerShell: {result.stdout.strip()}")
+    pids = find_pids(["ShellExperienceHost.exe", "RuntimeBroker.exe"])
+    # Independent kills: issue them concurrently rather than one after another
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        killed = sum(executor.map(terminate_pid, pids))
+    print(f"   [OK] Notification system refreshed ({killed}/{len(pids)} processes restarted)")
 except Exception as e:
-    print(f"   [WARNING] PowerShell refresh failed: {e}")
+    print(f"   [WARNING] Notification refresh failed: {e}")
 
 # Step 3: Open Windows Focus Assist settings
 print("\n3. Opening Windows Focus Assist settings...")
 print("   Please manually verify Focus Assist is set to 'Alarms only'")
 try:
     # Open Windows Settings > System > Focus Assist
-    subprocess.Popen(
-        ["ms-settings:quiethours"],
-        shell=True,
-        creationflags=subprocess.CREATE_NO_WINDOW
-    )
+    os.startfile("ms-settings:quiethours")  # ShellExecute directly, no cmd.exe
     print("   [OK] Windows Settings opened to Focus Assist page")
     print("   [ACTION REQUIRED] Please verify Focus Assist shows 'Alarms only'")
     print("   [ACTION REQUIRED] If it shows 'Off', toggle it to 'Alarms only'")
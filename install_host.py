@@ -15,6 +15,14 @@ ALLOWED_ORIGINS = [
     "chrome-extension://YOUR_EXTENSION_ID_HERE/"  # TODO: User needs to update this after loading extension
 ]
 
+def get_registered_manifest(key_path: str):
+    """Return the manifest path currently registered for the host, or None"""
+    try:
+        with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path) as key:
+            return winreg.QueryValueEx(key, "")[0]
+    except OSError:
+        return None
+
 def install_host():
     """Install the Native Messaging Host manifest and registry key"""
     
@@ -40,20 +48,33 @@ def install_host():
         "allowed_origins": ALLOWED_ORIGINS
     }
     
-    print(f"📝 Creating manifest at {manifest_path}...")
-    with open(manifest_path, 'w') as f:
-        json.dump(manifest, f, indent=2)
-        
-    # 3. Write to Windows Registry
+    new_bytes = json.dumps(manifest, indent=2).encode()
     key_path = f"SOFTWARE\\Google\\Chrome\\NativeMessagingHosts\\{HOST_NAME}"
     
+    # Skip the file write and registry transaction entirely when nothing changed
+    manifest_unchanged = manifest_path.exists() and manifest_path.read_bytes() == new_bytes
+    registry_unchanged = get_registered_manifest(key_path) == str(manifest_path)
+    if manifest_unchanged and registry_unchanged:
+        print(f"✅ Native messaging host already up-to-date ({manifest_path})")
+        return
+    
+    if not manifest_unchanged:
+        print(f"📝 Creating manifest at {manifest_path}...")
+        # Write to a sibling temp file and swap it in atomically
+        tmp_path = manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(new_bytes)
+        os.replace(tmp_path, manifest_path)
+        
+    # 3. Write to Windows Registry
     try:
-        # Try writing to HKEY_CURRENT_USER
-        print(f"🔑 Writing registry key: HKCU\\{key_path}")
-        reg_key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path)
-        winreg.SetValueEx(reg_key, "", 0, winreg.REG_SZ, str(manifest_path))
-        winreg.CloseKey(reg_key)
-        print("✅ Registry key created successfully!")
+        if registry_unchanged:
+            print(f"✅ Registry key already points at {manifest_path}")
+        else:
+            # Try writing to HKEY_CURRENT_USER
+            print(f"🔑 Writing registry key: HKCU\\{key_path}")
+            with winreg.CreateKeyEx(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE) as reg_key:
+                winreg.SetValueEx(reg_key, "", 0, winreg.REG_SZ, str(manifest_path))
+            print("✅ Registry key created successfully!")
         
     except Exception as e:
         print(f"❌ Failed to write registry key: {e}")
@@ -1,10 +1,18 @@
 import os
 import sys
+import re
+import errno
+import codecs
+import socket
+import shutil
+import selectors
+import signal
 import subprocess
 import threading
 import time
 import webbrowser
 from pathlib import Path
+from urllib.parse import urlparse
 import tkinter as tk
 from tkinter import ttk, messagebox
 
@@ -15,100 +23,174 @@ FRONTEND_DIR = ROOT / "frontend-react"
 BACKEND_MAIN = BACKEND_DIR / "main.py"
 ONBOARDING = BACKEND_DIR / "onboarding.py"
 CONFIG_FILE = ROOT / "user_config.json"
+# String forms used on every Popen, computed once
+ROOT_S, BACKEND_DIR_S, BACKEND_MAIN_S, ONBOARDING_S = map(str, (ROOT, BACKEND_DIR, BACKEND_MAIN, ONBOARDING))
+# Windows: skip the inherited-handle scan on spawn. POSIX: own process group so
+# stopping `npm run dev` also takes down the vite child it forks.
+if os.name == "nt":
+    _POPEN_KW = {"creationflags": subprocess.CREATE_NO_WINDOW, "close_fds": False}
+else:
+    _POPEN_KW = {"start_new_session": True}
 
 # Defaults
 API_URL = "http://127.0.0.1:8000/api/health"
 VITE_URL = "http://localhost:3000/"
 PREVIEW_URL = "http://127.0.0.1:4173"
+_VITE_PARSED = urlparse(VITE_URL)
+_VITE_HOST = _VITE_PARSED.hostname or "127.0.0.1"
+_VITE_PORT = _VITE_PARSED.port or (443 if _VITE_PARSED.scheme == "https" else 80)
+BACKEND_PORT = 8000
+# Frontend candidates in priority order: vite dev, common vite fallbacks, preview/static
+FRONTEND_PORTS = (5173, *range(3000, 3011), 4173)
+# Vite announces where it's serving: "Local:   http://localhost:5173/" (strip colours first)
+_VITE_RE = re.compile(r"Local:\s+(https?://\S+)")
+_ANSI_RE = re.compile(r"\x1b\[[0-9;]*m")
+# Seconds a port probe result is reused before reconnecting (override with FLOW_PROBE_TTL;
+# a malformed value falls back to the default rather than stopping the launcher)
+try:
+    PROBE_TTL = max(0.0, float(os.environ.get("FLOW_PROBE_TTL", "5.0")))
+except ValueError:
+    PROBE_TTL = 5.0
+# connect_ex() results meaning "non-blocking connect in progress"
+_CONNECT_PENDING = {errno.EINPROGRESS, errno.EWOULDBLOCK, getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK)}
+
+
+def _signal_tree(proc, terminate):
+    """Terminate/kill a child; on POSIX signal its whole session group."""
+    if os.name == "nt":
+        if terminate:
+            proc.terminate()
+        else:
+            proc.kill()
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGTERM if terminate else signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _pipe_bytes_available(fd):
+    """Windows pipes can't be made non-blocking; ask PeekNamedPipe how much is buffered."""
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+    avail = wintypes.DWORD()
+    handle = msvcrt.get_osfhandle(fd)
+    if not ctypes.windll.kernel32.PeekNamedPipe(handle, None, 0, None, ctypes.byref(avail), None):
+        raise BrokenPipeError("frontend pipe closed")
+    return avail.value
 
 class ProcessManager:
     def __init__(self):
         self.backend_proc = None
         self.frontend_proc = None
+        self._fe_plan = self._plan_frontend()
+        self._fe_decoder = None
+        self._fe_partial = ""
+
+    @staticmethod
+    def _plan_frontend():
+        """Resolve how to serve the frontend once: (argv, cwd), or None if impossible."""
+        # Prefer dev server via npm if available; fallback to static serve of a prebuilt dist
+        npm = shutil.which("npm")
+        if npm and (FRONTEND_DIR / "package.json").exists():
+            return [npm, "run", "dev"], str(FRONTEND_DIR)
+        dist = FRONTEND_DIR / "dist"
+        if dist.exists():
+            return [sys.executable, "-m", "http.server", "4173"], str(dist)
+        return None
 
     def start_backend(self):
         if self.backend_proc is not None:
             return
         try:
             self.backend_proc = subprocess.Popen(
-                [sys.executable, str(BACKEND_MAIN)],
-                cwd=str(ROOT),
-                creationflags=(subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+                [sys.executable, BACKEND_MAIN_S],
+                cwd=ROOT_S,
+                **_POPEN_KW
             )
         except Exception as e:
             self.backend_proc = None
             raise e
 
     def stop_backend(self):
-        if self.backend_proc is not None:
+        proc = self.backend_proc
+        if proc is not None:
+            self.backend_proc = None
+            # Wait for the actual exit (escalating to kill) rather than guessing with a sleep
             try:
-                self.backend_proc.terminate()
+                _signal_tree(proc, terminate=True)
+                try:
+                    proc.wait(timeout=1.0)
+                except subprocess.TimeoutExpired:
+                    _signal_tree(proc, terminate=False)
+                    proc.wait(timeout=1.0)
             except Exception:
                 pass
-            self.backend_proc = None
 
     def start_frontend(self):
         if self.frontend_proc is not None:
             return
-        # Prefer dev server via npm if available; fallback to preview or static serve
-        npm_cmd = "npm.cmd" if os.name == "nt" else "npm"
-        try:
-            if (FRONTEND_DIR / "package.json").exists():
-                self.frontend_proc = subprocess.Popen(
-                    [npm_cmd, "run", "dev"],
-                    cwd=str(FRONTEND_DIR),
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    creationflags=(subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
-                )
-                # Detach log reader thread
-                threading.Thread(target=self._pipe_logs, args=(self.frontend_proc.stdout,), daemon=True).start()
-            else:
-                raise FileNotFoundError("package.json not found in frontend-react")
-        except Exception:
-            # Fallback: try vite preview if built, else simple static server of dist
-            try:
-                self.frontend_proc = subprocess.Popen(
-                    [npm_cmd, "run", "preview"],
-                    cwd=str(FRONTEND_DIR),
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True,
-                    creationflags=(subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
-                )
-                threading.Thread(target=self._pipe_logs, args=(self.frontend_proc.stdout,), daemon=True).start()
-            except Exception:
-                # As a last resort, serve dist with Python if it exists
-                dist = FRONTEND_DIR / "dist"
-                if dist.exists():
-                    self.frontend_proc = subprocess.Popen(
-                        [sys.executable, "-m", "http.server", "4173"],
-                        cwd=str(dist),
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.STDOUT,
-                        text=True,
-                        creationflags=(subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
-                    )
-                    threading.Thread(target=self._pipe_logs, args=(self.frontend_proc.stdout,), daemon=True).start()
-                else:
-                    raise RuntimeError("Unable to start frontend. Ensure Node is installed or run `npm run build`.")
+        if self._fe_plan is None:
+            raise RuntimeError("Unable to start frontend. Ensure Node is installed or run `npm run build`.")
+        self.frontend_proc = self._spawn_and_pipe(*self._fe_plan)
+
+    def _spawn_and_pipe(self, argv, cwd):
+        proc = subprocess.Popen(
+            argv,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            **_POPEN_KW
+        )
+        # No reader thread: the UI's health tick drains the pipe via drain_frontend_logs()
+        if os.name != "nt":
+            os.set_blocking(proc.stdout.fileno(), False)
+        self._fe_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._fe_partial = ""
+        return proc
 
     def stop_frontend(self):
         if self.frontend_proc is not None:
             try:
-                self.frontend_proc.terminate()
+                _signal_tree(self.frontend_proc, terminate=True)
             except Exception:
                 pass
             self.frontend_proc = None
 
-    def _pipe_logs(self, pipe):
-        try:
-            for line in iter(pipe.readline, ''):
-                # Keep logs available in console if launched from terminal
-                sys.stdout.write("[frontend] " + line)
-        except Exception:
-            pass
+    def drain_frontend_logs(self):
+        """Forward whatever the frontend has printed so far, without blocking.
+
+        Reads in large chunks until the pipe is empty (npm/vite print bursts at startup)
+        and returns the complete lines so callers can watch for readiness markers.
+        """
+        proc = self.frontend_proc
+        if proc is None or proc.stdout is None:
+            return []
+        fd = proc.stdout.fileno()
+        chunks = []
+        while True:
+            try:
+                if os.name == "nt":
+                    size = _pipe_bytes_available(fd)
+                    if not size:
+                        break
+                    data = os.read(fd, min(size, 65536))
+                else:
+                    data = os.read(fd, 65536)
+            except (BlockingIOError, OSError, ValueError):
+                break
+            if not data:
+                break
+            chunks.append(data)
+        if not chunks:
+            return []
+        lines = (self._fe_partial + self._fe_decoder.decode(b"".join(chunks))).split("\n")
+        self._fe_partial = lines.pop()
+        if lines:
+            # Keep logs available in console if launched from terminal
+            sys.stdout.write("".join(f"[frontend] {line}\n" for line in lines))
+        return lines
 
 class LauncherUI:
     def __init__(self, root):
@@ -119,6 +201,22 @@ class LauncherUI:
 
         self.pm = ProcessManager()
 
+        # Health probe state: remember the frontend port that last answered and
+        # only sweep every candidate when it goes quiet.
+        self._last_fe_port = None
+        self._fe_port_misses = 0  # consecutive failed checks of _last_fe_port
+        self._fe_port_lock = threading.Lock()  # health worker and Tk thread (open_dashboard) both probe
+        self._probe_cache = {}  # (host, port) -> (ready, monotonic timestamp)
+        self._stop_evt = threading.Event()
+        # Latest probe results, written by the health worker and read on the Tk thread
+        self._status_lock = threading.Lock()
+        self._status = {"backend": False, "frontend": False}
+        self._posted_status = None  # last status handed to the Tk thread; None forces a post
+        # Set when there's reason to believe the frontend just came up; cuts the dashboard wait short
+        self._frontend_kick = threading.Event()
+        self._frontend_url = None  # scraped from vite's stdout; no probing needed once known
+        self._last_labels = {}  # status label -> (text, colour) last rendered
+
         self._setup_styles()
         self._build_ui()
 
@@ -191,11 +289,9 @@ class LauncherUI:
         status_frame = ttk.Frame(main)
         status_frame.pack(fill="x", pady=(0, 20))
         
-        self.lbl_backend = ttk.Label(status_frame, text="[ ] Backend System", style="Status.TLabel")
-        self.lbl_backend.pack(anchor="w", pady=2)
-        
-        self.lbl_frontend = ttk.Label(status_frame, text="[ ] Frontend Interface", style="Status.TLabel")
-        self.lbl_frontend.pack(anchor="w", pady=2)
+        # Each row: a "[STATUS]" label that ticks update, plus a static name label
+        self.lbl_backend = self._build_status_row(status_frame, "Backend System")
+        self.lbl_frontend = self._build_status_row(status_frame, "Frontend Interface")
 
         # Controls Grid
         controls = ttk.Frame(main)
@@ -218,10 +314,23 @@ class LauncherUI:
         self.btn_quit = ttk.Button(footer, text="TERMINATE", command=self.on_close)
         self.btn_quit.pack(fill="x")
 
-        # Background checkers
-        self._schedule_health_checks()
+        # Background checker: probes run off the Tk thread, results are posted back
+        threading.Thread(target=self._health_loop, daemon=True).start()
+
+    def _build_status_row(self, parent, name):
+        row = ttk.Frame(parent)
+        row.pack(anchor="w", pady=2)
+        status = ttk.Label(row, text="[ ]", style="Status.TLabel")
+        status.pack(side="left")
+        ttk.Label(row, text=name, style="Status.TLabel").pack(side="left", padx=(6, 0))
+        return status
 
     def safe_start_backend(self):
+        # A backend from a previous launch already owns the port: don't spawn one that
+        # would just fail to bind. Probe fresh (not cached) since a restart may have just killed it.
+        if self.pm.backend_proc is None and self._probe_ports((BACKEND_PORT,))[BACKEND_PORT]:
+            self._update_status(self.lbl_backend, "ONLINE", self.colors["ok"])
+            return
         try:
             self.pm.start_backend()
             self._update_status(self.lbl_backend, "RUNNING", self.colors["ok"])
@@ -233,106 +342,207 @@ class LauncherUI:
         try:
             self.pm.start_frontend()
             self._update_status(self.lbl_frontend, "STARTING", self.colors["warn"])
+            self._frontend_kick.set()
         except Exception as e:
             self._update_status(self.lbl_frontend, "FAILED", self.colors["danger"])
             messagebox.showwarning("Frontend Warning", str(e))
 
     def _update_status(self, label, status_text, color):
-        label.config(text=f"[{status_text}] {label.cget('text').split(' ', 1)[1]}", foreground=color)
+        # A label set outside the health loop may now disagree with the probe result;
+        # forget what was last posted so the next health tick re-applies it.
+        self._posted_status = None
+        self._render_label(label, status_text, color)
+
+    def _render_label(self, label, status_text, color):
+        # Skip no-op reconfigures so steady state costs Tk no redraws
+        rendered = (status_text, color)
+        if self._last_labels.get(label) == rendered:
+            return
+        self._last_labels[label] = rendered
+        label.config(text=f"[{status_text}]", foreground=color)
 
     def restart_backend(self):
-        self.pm.stop_backend()
         self._update_status(self.lbl_backend, "STOPPED", self.colors["muted"])
-        self.root.update()
-        time.sleep(0.5)
-        self.safe_start_backend()
+        # stop_backend blocks until the old process exits; keep that off the Tk thread
+        threading.Thread(target=self._do_restart, daemon=True).start()
+
+    def _do_restart(self):
+        self.pm.stop_backend()
+        self.root.after(0, self.safe_start_backend)
 
     def open_settings(self):
         if not ONBOARDING.exists():
             messagebox.showwarning("Settings", "Onboarding/settings module not found.")
             return
         try:
-            subprocess.Popen([sys.executable, str(ONBOARDING)], cwd=str(BACKEND_DIR))
+            subprocess.Popen([sys.executable, ONBOARDING_S], cwd=BACKEND_DIR_S)
         except Exception as e:
             messagebox.showerror("Settings Error", f"Failed to open settings: {e}")
 
     def open_dashboard(self):
-        # Prefer detected running ports: vite dev (5173) first, then common vite ports (3000-3010), then preview/static (4173).
-        if self._is_port_ready(5173):
-            webbrowser.open("http://127.0.0.1:5173")
+        # Vite told us its URL: no need to guess ports.
+        if self._frontend_url:
+            webbrowser.open(self._frontend_url)
             return
-        for p in range(3000, 3011):
-            if self._is_port_ready(p):
-                webbrowser.open(f"http://127.0.0.1:{p}")
-                return
-        if self._is_port_ready(4173):
-            webbrowser.open(PREVIEW_URL)
+        # Prefer detected running ports: vite dev (5173) first, then common vite ports (3000-3010), then preview/static (4173).
+        port = self._find_frontend_port()
+        if port is not None:
+            webbrowser.open(PREVIEW_URL if port == 4173 else f"http://127.0.0.1:{port}")
             return
         # Otherwise, try custom VITE_URL only if its port responds.
-        try:
-            from urllib.parse import urlparse
-            parsed = urlparse(VITE_URL)
-            port = parsed.port or (443 if parsed.scheme == "https" else 80)
-            host = parsed.hostname or "127.0.0.1"
-            if self._is_host_port_ready(host, port):
-                webbrowser.open(VITE_URL)
-                return
-        except Exception:
-            pass
+        if self._is_host_port_ready(_VITE_HOST, _VITE_PORT):
+            webbrowser.open(VITE_URL)
+            return
         # Fallback: open backend docs if frontend isn't ready
         webbrowser.open("http://localhost:3000/")
 
     def _wait_and_open_dashboard(self):
-        # Wait a bit for frontend to boot, then open once
-        for _ in range(60):
-            if self._is_port_ready(5173) or self._is_port_ready(4173):
-                time.sleep(0.3)
-                self.open_dashboard()
+        # Wait for frontend to boot (up to 30s), then open once. Probe every 250ms at
+        # first and back off toward 2s during a slow cold start; a kick wakes us early.
+        interval = 0.25
+        deadline = time.monotonic() + 30.0
+        while time.monotonic() < deadline:
+            if self._frontend_url or any(self._probe_ports((5173, 4173)).values()):
+                self.root.after(0, self.open_dashboard)
                 return
-            time.sleep(0.5)
+            if self._frontend_kick.wait(interval):
+                self._frontend_kick.clear()
+            else:
+                interval = min(interval * 1.3, 2.0)
 
     def _is_port_ready(self, port):
-        import socket
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(0.3)
-            try:
-                s.connect(("127.0.0.1", port))
-                return True
-            except Exception:
-                return False
+        return self._is_host_port_ready("127.0.0.1", port)
 
     def _is_host_port_ready(self, host, port):
-        import socket
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            s.settimeout(0.3)
-            try:
-                s.connect((host, port))
-                return True
-            except Exception:
-                return False
-
-    def _schedule_health_checks(self):
-        def tick():
-            # Backend
-            backend_ok = self._is_port_ready(8000)
-            if backend_ok:
-                self._update_status(self.lbl_backend, "ONLINE", self.colors["ok"])
+        cached = self._probe_cache.get((host, port))
+        if cached and time.monotonic() - cached[1] < PROBE_TTL:
+            return cached[0]
+        if host == "127.0.0.1":
+            return self._ports_ready((port,))[port]
+        try:
+            socket.create_connection((host, port), timeout=0.3).close()
+            ready = True
+        except OSError:
+            ready = False
+        self._probe_cache[(host, port)] = (ready, time.monotonic())
+        return ready
+
+    def _probe_ports(self, ports, timeout=0.3):
+        """Probe many loopback ports at once: one non-blocking connect per port, one selector wait."""
+        ready = {port: False for port in ports}
+        sel = selectors.DefaultSelector()
+        socks = []
+        try:
+            for port in ready:
+                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                socks.append(s)
+                s.setblocking(False)
+                err = s.connect_ex(("127.0.0.1", port))
+                if err == 0:
+                    ready[port] = True
+                elif err in _CONNECT_PENDING:
+                    sel.register(s, selectors.EVENT_WRITE, port)
+            deadline = time.monotonic() + timeout
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in sel.select(remaining):
+                    sel.unregister(key.fileobj)
+                    # Writable means the connect finished; SO_ERROR tells success from refusal
+                    ready[key.data] = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0
+        finally:
+            sel.close()
+            for s in socks:
+                s.close()
+        now = time.monotonic()
+        self._probe_cache.update((("127.0.0.1", port), (ok, now)) for port, ok in ready.items())
+        return ready
+
+    def _ports_ready(self, ports, fresh=()):
+        """Loopback readiness for many ports: fresh cache entries are reused, all stale ones share one fan-out.
+
+        Ports listed in ``fresh`` skip the cache and are always reconnected.
+        """
+        now = time.monotonic()
+        ready, stale = {}, []
+        for port in ports:
+            cached = self._probe_cache.get(("127.0.0.1", port))
+            if port not in fresh and cached and now - cached[1] < PROBE_TTL:
+                ready[port] = cached[0]
             else:
-                self._update_status(self.lbl_backend, "OFFLINE", self.colors["danger"])
-            
-            # Frontend
-            vite_ok = self._is_port_ready(5173) or any(self._is_port_ready(p) for p in range(3000, 3011))
-            fe_ok = vite_ok or self._is_port_ready(4173)
-            
-            if fe_ok:
-                self._update_status(self.lbl_frontend, "ONLINE", self.colors["ok"])
+                stale.append(port)
+        if stale:
+            ready.update(self._probe_ports(stale))
+        return ready
+
+    def _find_frontend_port(self, extra_ports=()):
+        # Common case: the port vite was last seen on is still up -> one connect.
+        # Only sweep every candidate when it's unknown or has failed twice in a row
+        # (a single miss is usually a blip; two means vite likely moved ports).
+        # The sticky port and the fallback sweep bypass the probe cache, so each counted
+        # miss is a real failed connect rather than a re-read of the previous one.
+        # extra_ports ride along in the same fan-out; their results land in the cache.
+        with self._fe_port_lock:
+            fe_port = self._last_fe_port
+            if fe_port is None:
+                ready = self._ports_ready((*extra_ports, *FRONTEND_PORTS))
             else:
-                self._update_status(self.lbl_frontend, "LOADING", self.colors["warn"])
-                
-            self.root.after(1000, tick)
-        self.root.after(1000, tick)
+                ready = self._ports_ready((*extra_ports, fe_port), fresh=(fe_port,))
+                if ready[fe_port]:
+                    self._fe_port_misses = 0
+                    return fe_port
+                self._fe_port_misses += 1
+                if self._fe_port_misses < 2:
+                    return None
+                ready.update(self._probe_ports(FRONTEND_PORTS))
+            self._fe_port_misses = 0
+            self._last_fe_port = next((p for p in FRONTEND_PORTS if ready.get(p)), None)
+            return self._last_fe_port
+
+    def _health_loop(self):
+        # Long-lived worker: wake every second (or immediately on close), probe, post to Tk.
+        while not self._stop_evt.wait(1.0):
+            try:
+                for line in self.pm.drain_frontend_logs():
+                    match = _VITE_RE.search(_ANSI_RE.sub("", line))
+                    if match:
+                        self._frontend_url = match.group(1)
+                        self._frontend_kick.set()
+                # Backend and frontend candidates are probed concurrently in one selector wait
+                fe_port = self._find_frontend_port(extra_ports=(BACKEND_PORT,))
+                status = {
+                    "backend": self._is_port_ready(BACKEND_PORT),
+                    "frontend": fe_port is not None,
+                }
+                # Notify on change only: an unchanged result costs the Tk thread nothing
+                with self._status_lock:
+                    self._status = status
+                    changed = status != self._posted_status
+                    if changed:
+                        self._posted_status = status
+                if changed and not self._stop_evt.is_set():
+                    self.root.after_idle(self._apply_health)
+            except Exception:
+                pass
+
+    def _apply_health(self):
+        # Tk thread: only reads the shared status, never touches sockets
+        with self._status_lock:
+            status = self._status.copy()
+
+        if status["backend"]:
+            self._render_label(self.lbl_backend, "ONLINE", self.colors["ok"])
+        else:
+            self._render_label(self.lbl_backend, "OFFLINE", self.colors["danger"])
+
+        if status["frontend"]:
+            self._render_label(self.lbl_frontend, "ONLINE", self.colors["ok"])
+        else:
+            self._render_label(self.lbl_frontend, "LOADING", self.colors["warn"])
 
     def on_close(self):
+        self._stop_evt.set()
         try:
             self.pm.stop_frontend()
             self.pm.stop_backend()
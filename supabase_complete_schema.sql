@@ -133,6 +133,17 @@ BEGIN
   WHERE cognitive_profile IS NULL OR sessions_count IS NULL OR onboarding_complete IS NULL;
 END $$;
 
+-- Column listing for verify_supabase_schema.py: checks the schema without reading any rows
+CREATE OR REPLACE FUNCTION list_user_columns()
+RETURNS TABLE (column_name TEXT, data_type TEXT)
+LANGUAGE sql STABLE
+AS $$
+  SELECT c.column_name::text, c.data_type::text
+  FROM information_schema.columns c
+  WHERE c.table_schema = 'public' AND c.table_name = 'users'
+  ORDER BY c.ordinal_position;
+$$;
+
 -- Verify the schema
 SELECT 
   table_name,
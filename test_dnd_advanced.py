@@ -5,48 +5,41 @@ import winreg
 import subprocess
 import ctypes
 import sys
+from dnd_registry import read_dwords, wait_for_dword
 
 print("=" * 60)
 print("Advanced DND Activation Test")
 print("=" * 60)
 
-# Method 1: Registry (already done)
+# Method 1: Registry - core Focus Assist/toast values plus additional notification keys
 print("\n1. Setting Registry Values...")
 qh_key = r"Software\Microsoft\Windows\CurrentVersion\QuietHours"
 notif_key = r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings"
 
-try:
-    with winreg.CreateKey(winreg.HKEY_CURRENT_USER, qh_key) as key:
-        winreg.SetValueEx(key, "FocusAssist", 0, winreg.REG_DWORD, 2)
-    print("   [OK] Focus Assist = 2")
-except Exception as e:
-    print(f"   [ERROR] {e}")
-
-try:
-    with winreg.CreateKey(winreg.HKEY_CURRENT_USER, notif_key) as key:
-        winreg.SetValueEx(key, "NOC_GLOBAL_SETTING_TOASTS_ENABLED", 0, winreg.REG_DWORD, 0)
-    print("   [OK] Toast Notifications = 0 (disabled)")
-except Exception as e:
-    print(f"   [ERROR] {e}")
-
-# Method 2: Additional registry keys for comprehensive blocking
-print("\n2. Setting Additional Notification Registry Keys...")
-additional_keys = [
+registry_values = [
+    (qh_key, "FocusAssist", 2),
+    (notif_key, "NOC_GLOBAL_SETTING_TOASTS_ENABLED", 0),
     (r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings\Windows.SystemToast.SecurityAndMaintenance", "Enabled", 0),
-    (r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings", "NOC_GLOBAL_SETTING_BANNER_ENABLED", 0),
-    (r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings", "NOC_GLOBAL_SETTING_SOUND_ENABLED", 0),
+    (notif_key, "NOC_GLOBAL_SETTING_BANNER_ENABLED", 0),
+    (notif_key, "NOC_GLOBAL_SETTING_SOUND_ENABLED", 0),
 ]
 
-for key_path, value_name, value in additional_keys:
+# Open each key once and write all of its values under that single handle
+grouped = {}
+for key_path, value_name, value in registry_values:
+    grouped.setdefault(key_path, []).append((value_name, value))
+
+for key_path, entries in grouped.items():
     try:
         with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-            winreg.SetValueEx(key, value_name, 0, winreg.REG_DWORD, value)
-        print(f"   [OK] {key_path}\\{value_name} = {value}")
+            for value_name, value in entries:
+                winreg.SetValueEx(key, value_name, 0, winreg.REG_DWORD, value)
+                print(f"   [OK] {key_path}\\{value_name} = {value}")
     except Exception as e:
         print(f"   [SKIP] {key_path}: {e}")
 
-# Method 3: Use PowerShell with Windows Runtime API
-print("\n3. Using PowerShell with Windows Runtime API...")
+# Method 2: Use PowerShell with Windows Runtime API
+print("\n2. Using PowerShell with Windows Runtime API...")
 ps_command = '''
 # Force enable Focus Assist
 $path = "HKCU:\\Software\\Microsoft\\Windows\\CurrentVersion\\QuietHours"
@@ -85,50 +78,68 @@ $result = [IntPtr]::Zero
 $type::SendMessageTimeout($HWND_BROADCAST, $WM_SETTINGCHANGE, [IntPtr]::Zero, "UserPreferences", 2, 5000, [ref]$result)
 Write-Output "Settings change broadcasted"
 '''
-try:
-    result = subprocess.run(
-        ["powershell", "-ExecutionPolicy", "Bypass", "-Command", ps_command],
-        capture_output=True,
-        text=True,
-        timeout=15,
-        creationflags=subprocess.CREATE_NO_WINDOW
-    )
-    print(f"   PowerShell Output:\n{result.stdout}")
-    if result.stderr:
-        print(f"   PowerShell Errors:\n{result.stderr[:500]}")
-except Exception as e:
-    print(f"   [ERROR] PowerShell failed: {e}")
 
-# Method 4: Restart notification-related services
-print("\n4. Restarting Notification Services...")
+# Method 3: Restart notification-related services (runs in the same PowerShell process)
 restart_cmd = '''
 Get-Process -Name "ShellExperienceHost" -ErrorAction SilentlyContinue | Stop-Process -Force -ErrorAction SilentlyContinue
 Start-Sleep -Seconds 2
 Get-Process -Name "RuntimeBroker" -ErrorAction SilentlyContinue | Where-Object {$_.MainWindowTitle -eq ""} | Stop-Process -Force -ErrorAction SilentlyContinue
 Write-Output "Notification services restarted"
 '''
+
+# One PowerShell startup for both steps; section markers split the output back up per step
+combined_script = "\n".join([
+    'Write-Output "###SECTION:winrt"', ps_command,
+    'Write-Output "###SECTION:restart"', restart_cmd,
+])
+sections = {}
 try:
-    result = subprocess.run(
-        ["powershell", "-Command", restart_cmd],
-        capture_output=True,
+    proc = subprocess.Popen(
+        ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", combined_script],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
-        timeout=10,
         creationflags=subprocess.CREATE_NO_WINDOW
     )
-    print(f"   {result.stdout.strip()}")
+    try:
+        stdout, stderr = proc.communicate(timeout=25)
+    except subprocess.TimeoutExpired:
+        # Kill and reap so whatever PowerShell printed so far is still reported
+        proc.kill()
+        stdout, stderr = proc.communicate()
+        print("   [WARNING] PowerShell timed out after 25s")
+    current = None
+    for line in stdout.splitlines():
+        if line.startswith("###SECTION:"):
+            current = line.split(":", 1)[1]
+            sections[current] = []
+        elif current:
+            sections[current].append(line)
+    print("   PowerShell Output:\n" + "\n".join(sections.get("winrt", [])))
+    if stderr:
+        print(f"   PowerShell Errors:\n{stderr[:500]}")
 except Exception as e:
-    print(f"   [WARNING] Service restart failed: {e}")
+    print(f"   [ERROR] PowerShell failed: {e}")
 
-# Method 5: Verify final state
-print("\n5. Final Verification:")
-import time
-time.sleep(1)
-try:
-    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, qh_key, 0, winreg.KEY_READ) as key:
-        val, _ = winreg.QueryValueEx(key, "FocusAssist")
-        print(f"   Focus Assist: {val} {'[OK]' if val == 2 else '[NOT SET]'}")
-except Exception as e:
-    print(f"   [ERROR] Could not verify: {e}")
+print("\n3. Restarting Notification Services...")
+if "restart" in sections:
+    restart_output = "\n".join(sections["restart"]).strip()
+    print(f"   {restart_output}")
+else:
+    print("   [WARNING] Service restart did not run")
+
+# Method 4: Verify final state
+print("\n4. Final Verification:")
+# Returns as soon as the write is visible instead of always sleeping a full second
+wait_for_dword(qh_key, "FocusAssist", 2, timeout=1.0)
+for key_path, entries in grouped.items():
+    try:
+        actual = read_dwords(key_path, [value_name for value_name, _ in entries])
+        for value_name, expected in entries:
+            val = actual[value_name]
+            print(f"   {value_name}: {val} {'[OK]' if val == expected else '[NOT SET]'}")
+    except Exception as e:
+        print(f"   [ERROR] Could not verify {key_path}: {e}")
 
 print("\n" + "=" * 60)
 print("If notifications still appear:")
@@ -1,7 +1,6 @@
 """Comprehensive DND test with PowerShell"""
 import subprocess
-import winreg
-import time
+from dnd_registry import read_dwords, wait_for_dword
 
 print("=" * 60)
 print("Comprehensive DND Test")
@@ -13,16 +12,14 @@ qh_key = r"Software\Microsoft\Windows\CurrentVersion\QuietHours"
 notif_key = r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings"
 
 try:
-    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, qh_key, 0, winreg.KEY_READ) as key:
-        val, _ = winreg.QueryValueEx(key, "FocusAssist")
-        print(f"   Focus Assist: {val} (should be 2)")
+    val = read_dwords(qh_key, ["FocusAssist"])["FocusAssist"]
+    print(f"   Focus Assist: {val} (should be 2)")
 except Exception as e:
     print(f"   Focus Assist: Error - {e}")
 
 try:
-    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, notif_key, 0, winreg.KEY_READ) as key:
-        toast_val, _ = winreg.QueryValueEx(key, "NOC_GLOBAL_SETTING_TOASTS_ENABLED")
-        print(f"   Toast Notifications: {toast_val} (should be 0)")
+    toast_val = read_dwords(notif_key, ["NOC_GLOBAL_SETTING_TOASTS_ENABLED"])["NOC_GLOBAL_SETTING_TOASTS_ENABLED"]
+    print(f"   Toast Notifications: {toast_val} (should be 0)")
 except Exception as e:
     print(f"   Toast Notifications: Error - {e}")
 
@@ -34,33 +31,38 @@ Set-ItemProperty -Path $path -Name "FocusAssist" -Value 2 -Type DWord -Force
 Write-Output "Focus Assist set to 2"
 '''
 try:
-    result = subprocess.run(
-        ["powershell", "-Command", ps_command],
-        capture_output=True,
+    proc = subprocess.Popen(
+        ["powershell", "-NoProfile", "-Command", ps_command],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         text=True,
-        timeout=5,
         creationflags=subprocess.CREATE_NO_WINDOW
     )
-    print(f"   PowerShell output: {result.stdout.strip()}")
-    if result.returncode == 0:
+    try:
+        stdout, stderr = proc.communicate(timeout=5)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        stdout, stderr = proc.communicate()
+        print("   [WARNING] PowerShell timed out after 5s")
+    print(f"   PowerShell output: {stdout.strip()}")
+    if proc.returncode == 0:
         print("   [OK] PowerShell command succeeded")
     else:
-        print(f"   [WARNING] PowerShell returned code {result.returncode}")
-        print(f"   Error: {result.stderr[:200]}")
+        print(f"   [WARNING] PowerShell returned code {proc.returncode}")
+        print(f"   Error: {stderr[:200]}")
 except Exception as e:
     print(f"   [ERROR] PowerShell failed: {e}")
 
 # Test 3: Verify after PowerShell
-time.sleep(0.5)
+wait_for_dword(qh_key, "FocusAssist", 2, timeout=0.5)
 print("\n3. Verification after PowerShell:")
 try:
-    with winreg.OpenKey(winreg.HKEY_CURRENT_USER, qh_key, 0, winreg.KEY_READ) as key:
-        val, _ = winreg.QueryValueEx(key, "FocusAssist")
-        print(f"   Focus Assist: {val}")
-        if val == 2:
-            print("   [OK] Focus Assist is correctly set to 2")
-        else:
-            print("   [WARNING] Focus Assist is not set correctly")
+    val = read_dwords(qh_key, ["FocusAssist"])["FocusAssist"]
+    print(f"   Focus Assist: {val}")
+    if val == 2:
+        print("   [OK] Focus Assist is correctly set to 2")
+    else:
+        print("   [WARNING] Focus Assist is not set correctly")
 except Exception as e:
     print(f"   [ERROR] Could not verify: {e}")
 
@@ -4,17 +4,14 @@ Test AI Classifier with real Groq API
 
 import os
 import sys
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 sys.path.insert(0, 'backend')
 
-from ai_classifier import AIClassifier
-
 def test_with_groq_api():
     """Test AI classifier with real Groq API"""
+    # ai_classifier reads its key at import time, so import after .env is loaded
+    from ai_classifier import AIClassifier
+
     print("=" * 70)
     print("GROQ API LIVE TEST")
     print("=" * 70)
@@ -28,7 +25,8 @@ def test_with_groq_api():
     
     print(f"✓ API Key found: {api_key[:10]}...{api_key[-4:]}")
     
-    # Create classifier
+    # Create classifier - one instance for all tests so its keep-alive
+    # session pays the TLS handshake to api.groq.com only once
     classifier = AIClassifier()
     print(f"✓ Classifier initialized (fallback mode: {classifier.use_fallback})")
     
@@ -112,5 +110,9 @@ def test_with_groq_api():
     return True
 
 if __name__ == "__main__":
+    # Load environment variables
+    from dotenv import load_dotenv
+    load_dotenv()
+
     success = test_with_groq_api()
     sys.exit(0 if success else 1)
@@ -9,6 +9,10 @@ from main import state, enable_dnd, _check_and_auto_start_flow
 from datetime import datetime, timedelta
 import asyncio
 
+# One event loop for every async check below instead of an asyncio.run() per call
+loop = asyncio.new_event_loop()
+asyncio.set_event_loop(loop)
+
 print("=" * 60)
 print("Tri-Layer Flow Detection Test")
 print("=" * 60)
@@ -38,7 +42,7 @@ print(f"   Layer3 started at: {state.active_streak_start}")
 
 # Test 5: Check if all layers are active (but not long enough)
 print("\n5. Checking tri-layer status (immediately):")
-asyncio.run(_check_and_auto_start_flow())
+loop.run_until_complete(_check_and_auto_start_flow())
 print(f"   Is running: {state.is_running}")
 
 # Test 6: Simulate time passing (set times to be old enough)
@@ -53,7 +57,7 @@ state.is_running = False
 
 # Test 7: Check tri-layer again (should trigger)
 print("\n7. Checking tri-layer status (after threshold):")
-asyncio.run(_check_and_auto_start_flow())
+loop.run_until_complete(_check_and_auto_start_flow())
 print(f"   Is running: {state.is_running}")
 
 # Test 8: Test DND activation
@@ -70,3 +74,4 @@ print("\n" + "=" * 60)
 print("Test Complete")
 print("=" * 60)
 
+loop.close()
@@ -0,0 +1,68 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+# run_flow.py lives at the repo root
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import run_flow
+
+def make_launcher(up_ports, sticky=None):
+    """LauncherUI without Tk: just the probe state, with _probe_ports stubbed to answer from up_ports"""
+    ui = run_flow.LauncherUI.__new__(run_flow.LauncherUI)
+    ui._last_fe_port = sticky
+    ui._fe_port_misses = 0
+    ui._fe_port_lock = threading.Lock()
+    ui._probe_cache = {}
+    ui.probes = []
+    
+    def fake_probe_ports(ports, timeout=0.3):
+        ui.probes.append(tuple(ports))
+        ready = {port: port in up_ports for port in ports}
+        # Fill the cache like the real probe, so a reused result would be caught
+        now = time.monotonic()
+        ui._probe_cache.update((("127.0.0.1", port), (ok, now)) for port, ok in ready.items())
+        return ready
+    
+    ui._probe_ports = fake_probe_ports
+    return ui
+
+def test_sticky_port():
+    """Sticky frontend port: one probe on a hit, tolerate one miss, sweep and re-pin on the second"""
+    try:
+        # Hit on the sticky port costs a single probe of just that port
+        ui = make_launcher(up_ports={5173}, sticky=5173)
+        assert ui._find_frontend_port() == 5173
+        assert ui.probes == [(5173,)], f"Unexpected probes: {ui.probes!r}"
+        print("✅ Sticky hit uses one probe")
+        
+        # Vite moved: first miss is treated as a blip, the port stays pinned
+        ui = make_launcher(up_ports={3001}, sticky=5173)
+        assert ui._find_frontend_port() is None
+        assert ui._last_fe_port == 5173 and ui._fe_port_misses == 1
+        assert ui.probes == [(5173,)], f"Unexpected probes: {ui.probes!r}"
+        print("✅ Single miss keeps the sticky port")
+        
+        # Second fresh miss (cached result must not be reused) sweeps and re-pins
+        assert ui._find_frontend_port() == 3001
+        assert ui.probes == [(5173,), (5173,), run_flow.FRONTEND_PORTS], f"Unexpected probes: {ui.probes!r}"
+        assert ui._last_fe_port == 3001 and ui._fe_port_misses == 0
+        print("✅ Second miss sweeps and re-pins to the new port")
+        
+        # A blip followed by a successful probe keeps the sticky port without a sweep
+        up_ports = set()
+        ui = make_launcher(up_ports, sticky=5173)
+        assert ui._find_frontend_port() is None
+        up_ports.add(5173)
+        assert ui._find_frontend_port() == 5173
+        assert ui.probes == [(5173,), (5173,)], f"Unexpected probes: {ui.probes!r}"
+        assert ui._last_fe_port == 5173 and ui._fe_port_misses == 0
+        print("✅ Sticky port survives a single failed probe")
+        return True
+    except AssertionError as e:
+        print(f"❌ Test failed: {e}")
+        return False
+
+if __name__ == "__main__":
+    sys.exit(0 if test_sticky_port() else 1)
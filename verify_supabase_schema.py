@@ -21,42 +21,68 @@ if not client:
 
 print("\n[OK] Connected to Supabase")
 
+# Columns the backend reads and writes on users
+REQUIRED_COLUMNS = ('id', 'name', 'level', 'total_xp', 'baseline_focus_minutes', 'cognitive_profile', 'onboarding_data', 'sessions_count', 'onboarding_complete')
+
+def fetch_user_columns(client):
+    """Return {column_name: data_type} for the users table in one round-trip, without row data"""
+    try:
+        rows = client.rpc('list_user_columns').execute().data or []
+        return {row['column_name']: row['data_type'] for row in rows}
+    except Exception as e:
+        if "PGRST202" not in str(e) and "Could not find the function" not in str(e):
+            raise
+    # list_user_columns() not installed yet: selecting the columns by name still proves they exist
+    print("[INFO] list_user_columns() not found (run supabase_complete_schema.sql to add it); reading a row instead")
+    result = client.table('users').select(', '.join(REQUIRED_COLUMNS)).limit(1).execute()
+    row = result.data[0] if result.data else {}
+    return {key: type(row[key]).__name__ if key in row else 'unknown' for key in REQUIRED_COLUMNS}
+
+def print_missing_table_help():
+    print("\n[ERROR] Users table does not exist in Supabase")
+    print("\nACTION REQUIRED:")
+    print("1. Go to https://app.supabase.com")
+    print("2. Open SQL Editor")
+    print("3. Run the SQL from: supabase_complete_schema.sql")
+    print("4. Then run this script again")
+
+def print_missing_columns_help():
+    print("\n[ERROR] Some columns are missing")
+    print("\nACTION REQUIRED:")
+    print("1. Go to https://app.supabase.com")
+    print("2. Open SQL Editor")
+    print("3. Run the SQL from: supabase_schema_update.sql")
+    print("4. This will add the missing columns")
+
 # Check if users table exists and has required columns
 print("\nChecking users table schema...")
 try:
-    # Try to query the table structure
-    result = client.table('users').select('id, name, level, total_xp, baseline_focus_minutes, cognitive_profile, onboarding_data, sessions_count, onboarding_complete').limit(1).execute()
-    print("[OK] Users table exists and is accessible")
-    
-    # Check if we can read the new fields
-    if result.data:
-        user_data = result.data[0]
-        print("\nTable columns found:")
-        for key in ['id', 'name', 'level', 'total_xp', 'baseline_focus_minutes', 'cognitive_profile', 'onboarding_data', 'sessions_count', 'onboarding_complete']:
-            if key in user_data:
-                print(f"  [OK] {key}: {type(user_data[key]).__name__}")
-            else:
-                print(f"  [MISSING] {key}")
-    
-    print("\n[SUCCESS] All required fields are present!")
-    print("\nNext: Run the Flow Engine backend to start using Supabase")
+    columns = fetch_user_columns(client)
+    if not columns:
+        print_missing_table_help()
+    else:
+        print("[OK] Users table exists and is accessible")
+        
+        # One write for the whole column report
+        lines = [
+            f"  [OK] {key}: {columns[key]}" if key in columns else f"  [MISSING] {key}"
+            for key in REQUIRED_COLUMNS
+        ]
+        sys.stdout.write("\nTable columns found:\n" + "\n".join(lines) + "\n")
+        
+        missing = set(REQUIRED_COLUMNS) - set(columns)
+        if missing:
+            print_missing_columns_help()
+        else:
+            print("\n[SUCCESS] All required fields are present!")
+            print("\nNext: Run the Flow Engine backend to start using Supabase")
     
 except Exception as e:
     error_msg = str(e)
     if "Could not find the table" in error_msg or "PGRST205" in error_msg:
-        print("\n[ERROR] Users table does not exist in Supabase")
-        print("\nACTION REQUIRED:")
-        print("1. Go to https://app.supabase.com")
-        print("2. Open SQL Editor")
-        print("3. Run the SQL from: supabase_complete_schema.sql")
-        print("4. Then run this script again")
+        print_missing_table_help()
     elif "column" in error_msg.lower() or "does not exist" in error_msg.lower():
-        print("\n[ERROR] Some columns are missing")
-        print("\nACTION REQUIRED:")
-        print("1. Go to https://app.supabase.com")
-        print("2. Open SQL Editor")
-        print("3. Run the SQL from: supabase_schema_update.sql")
-        print("4. This will add the missing columns")
+        print_missing_columns_help()
     else:
         print(f"\n[ERROR] {error_msg}")
         print("\nCheck your Supabase project settings and RLS policies")